@@ -8,7 +8,6 @@ import pandas as pd
 import sqlite3
 import hashlib
 import os
-import matplotlib.pyplot as plt
 
 DB_FILE = "users.db"
 
@@ -36,11 +35,7 @@ def init_users():
         ("student3", hash_password("password123"), "user")
     ]
 
-    for u in users:
-        try:
-            c.execute("INSERT INTO users VALUES (?,?,?)", u)
-        except:
-            pass
+    c.executemany("INSERT OR IGNORE INTO users VALUES (?,?,?)", users)
     conn.commit()
     conn.close()
 
@@ -65,13 +60,21 @@ def login():
 # ===================== DATA LOADING =====================
 
 def load_data():
-    df = pd.read_csv("synthetic_medical_symptoms_and_diagnosis_dataset.csv")
-
     symptom_columns = [
         'fever','cough','fatigue','headache','muscle_pain','nausea','vomiting',
         'diarrhea','skin_rash','loss_smell','loss_taste'
     ]
 
+    # only the columns we use, with compact dtypes
+    read_args = dict(
+        usecols=symptom_columns + ["diagnosis"],
+        dtype={**{s: "float32" for s in symptom_columns}, "diagnosis": "category"},
+    )
+    try:
+        df = pd.read_csv("synthetic_medical_symptoms_and_diagnosis_dataset.csv", engine="pyarrow", **read_args)
+    except ImportError:
+        df = pd.read_csv("synthetic_medical_symptoms_and_diagnosis_dataset.csv", **read_args)
+
     return df, symptom_columns
 
 # ===================== STATISTICS =====================
@@ -81,8 +84,9 @@ def show_stats(df, symptoms):
     print(df["diagnosis"].value_counts().head())
 
     print("\nMost common symptoms:")
-    for s in symptoms:
-        print(s, ":", df[s].sum())
+    sums = df[symptoms].sum()
+    for s, v in sums.items():
+        print(s, ":", int(v))
 
     avg = df[symptoms].sum(axis=1).mean()
     print("\nAverage number of symptoms per patient:", round(avg,2))
@@ -90,6 +94,8 @@ def show_stats(df, symptoms):
 # ===================== PLOTS =====================
 
 def plot_symptoms(df, symptoms):
+    import matplotlib.pyplot as plt  # imported here so startup doesn't pay for it
+
     counts = df[symptoms].sum()
     counts.plot(kind="bar")
     plt.title("Symptom Frequency")
@@ -97,21 +103,35 @@ def plot_symptoms(df, symptoms):
 
 # ===================== DIAGNOSIS CHECKER =====================
 
+# id(df) -> (df, symptoms, per-diagnosis means, {sorted symptom tuple: top diagnoses}).
+# Holding df stops its id being reused while cached; only the latest dataset is kept.
+_DIAG_CACHE = {}
+
+def _diag_cache(df, symptoms):
+    entry = _DIAG_CACHE.get(id(df))
+    if entry is None or entry[0] is not df or entry[1] != tuple(symptoms):
+        _DIAG_CACHE.clear()
+        means = df.groupby("diagnosis", observed=True)[symptoms].mean()
+        entry = (df, tuple(symptoms), means, {})
+        _DIAG_CACHE[id(df)] = entry
+    return entry
+
+def _top_diagnoses(df, symptoms, resolved):
+    # score = sum of per-diagnosis means over the entered symptoms (one groupby pass)
+    _, _, means, rankings = _diag_cache(df, symptoms)
+    key = tuple(sorted(resolved))
+    if key not in rankings:
+        rankings[key] = tuple(means[list(key)].sum(axis=1).nlargest(3).index)
+    return rankings[key]
+
 def symptom_checker(df, symptoms):
     user_input = input("Enter symptoms separated by commas: ").lower().split(",")
 
-    scores = {}
-    for diag in df["diagnosis"].unique():
-        subset = df[df["diagnosis"]==diag]
-        score = 0
-        for s in user_input:
-            s=s.strip()
-            if s in symptoms:
-                score += subset[s].mean()
-        scores[diag]=score
+    symptom_set = frozenset(symptoms)
+    resolved = [s.strip() for s in user_input if s.strip() in symptom_set]
 
     print("\nLikely diagnoses:")
-    for d in sorted(scores,key=scores.get,reverse=True)[:3]:
+    for d in _top_diagnoses(df, symptoms, resolved):
         print(d)
 
 # ===================== MAIN =====================
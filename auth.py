@@ -10,13 +10,16 @@ Provides:
 
 from __future__ import annotations
 
+import atexit
 import hashlib
+import json
 import os
-import re
 import secrets
 import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 DEFAULT_DB_PATH = os.path.join(
@@ -24,6 +27,13 @@ DEFAULT_DB_PATH = os.path.join(
     "users.db",
 )
 
+# Demo accounts with precomputed PBKDF2 salt/hash, so first run does no hashing.
+# Passwords: admin / Admin123!, student1 and student2 / Student123!, guest / Guest123!
+SEED_USERS_PATH = os.path.join(
+    os.path.dirname(__file__) if "__file__" in globals() else os.getcwd(),
+    "seed_users.json",
+)
+
 
 @dataclass(frozen=True)
 class User:
@@ -33,17 +43,61 @@ class User:
     is_admin: bool
 
 
+# Statement text is kept identical across calls so sqlite3's per-connection
+# statement cache (cached_statements, 128 by default) reuses the compiled plan.
+_INSERT_USER_SQL = (
+    "INSERT INTO users (username, salt, pw_hash, is_admin, created_at) VALUES (?, ?, ?, ?, datetime('now'))"
+)
+
+
+# Connections are opened once per (thread, db_path) and reused for the process lifetime.
+_CONNS: Dict[Tuple[int, str], sqlite3.Connection] = {}
+_CONNS_LOCK = threading.Lock()
+
+
 def _connect(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
-    """Open a SQLite connection with Row factory enabled."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    """
+    Return this thread's cached SQLite connection for db_path (Row factory enabled).
+
+    Use it as `with _connect(...) as conn:` to scope a transaction; the context
+    manager commits or rolls back but does not close the shared connection.
+    """
+    key = (threading.get_ident(), db_path)
+    conn = _CONNS.get(key)
+    if conn is None:
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL + NORMAL sync: fewer fsyncs per commit, readers don't block the writer.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-8000")
+        with _CONNS_LOCK:
+            _CONNS[key] = conn
     return conn
 
 
+def close_connections() -> None:
+    """Close every cached SQLite connection (registered to run at interpreter exit)."""
+    with _CONNS_LOCK:
+        conns = list(_CONNS.values())
+        _CONNS.clear()
+    for conn in conns:
+        conn.close()
+
+
+atexit.register(close_connections)
+
+# Background workers for PBKDF2 so the UI can report progress while a hash runs.
+_HASH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pw-hash")
+
+
 def _hash_password(password: str, salt: bytes, iterations: int = 200_000) -> bytes:
     """Hash a password using PBKDF2-HMAC-SHA256 with a provided salt."""
     if not isinstance(password, str) or password == "":
         raise ValueError("Password must be a non-empty string.")
+    # hashlib.pbkdf2_hmac is backed by OpenSSL's PBKDF2 (the same EVP code that
+    # cryptography's PBKDF2HMAC calls), which uses SHA-NI where the CPU has it.
     return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
 
 
@@ -59,17 +113,38 @@ def validate_password_rules(password: str) -> Tuple[bool, str]:
         return False, "Password must be text."
     if len(password) < 8:
         return False, "Password must be at least 8 characters."
-    if not re.search(r"[a-z]", password):
+
+    # One pass over the string; the checks mirror [a-z], [A-Z], \d and [^\w\s].
+    has_lower = has_upper = has_digit = has_special = False
+    for ch in password:
+        if "a" <= ch <= "z":
+            has_lower = True
+        elif "A" <= ch <= "Z":
+            has_upper = True
+        elif ch.isdecimal():
+            has_digit = True
+        elif not (ch.isalnum() or ch == "_" or ch.isspace()):
+            has_special = True
+        if has_lower and has_upper and has_digit and has_special:
+            break
+
+    if not has_lower:
         return False, "Password must contain at least one lowercase letter."
-    if not re.search(r"[A-Z]", password):
+    if not has_upper:
         return False, "Password must contain at least one uppercase letter."
-    if not re.search(r"\d", password):
+    if not has_digit:
         return False, "Password must contain at least one digit."
-    if not re.search(r"[^\w\s]", password):
+    if not has_special:
         return False, "Password must contain at least one special character (e.g., !@#$%)."
     return True, "OK"
 
 
+def _load_seed_users() -> List[dict]:
+    """Load the prehashed demo accounts shipped in seed_users.json."""
+    with open(SEED_USERS_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
 def init_db(db_path: str = DEFAULT_DB_PATH) -> None:
     """Initialize the SQLite user database and seed demo accounts (idempotent)."""
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
@@ -87,27 +162,23 @@ def init_db(db_path: str = DEFAULT_DB_PATH) -> None:
             )
             """
         )
+        # Explicit name for the username lookup index; every schema this app creates
+        # already declares username UNIQUE, so this never has duplicates to reject.
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users(username)")
+
+        rows = [
+            (u["username"], bytes.fromhex(u["salt"]), bytes.fromhex(u["pw_hash"]), 1 if u["is_admin"] else 0)
+            for u in _load_seed_users()
+        ]
+        conn.executemany(
+            "INSERT OR IGNORE INTO users (username, salt, pw_hash, is_admin, created_at) VALUES (?, ?, ?, ?, datetime('now'))",
+            rows,
+        )
         conn.commit()
 
-    seed_users = [
-        ("admin", "Admin123!", True),
-        ("student1", "Student123!", False),
-        ("student2", "Student123!", False),
-        ("guest", "Guest123!", False),
-    ]
-    for username, password, is_admin in seed_users:
-        if get_user_by_username(username, db_path=db_path) is None:
-            create_user(username, password, is_admin=is_admin, db_path=db_path, enforce_rules=False)
 
-
-def create_user(
-    username: str,
-    password: str,
-    is_admin: bool = False,
-    db_path: str = DEFAULT_DB_PATH,
-    enforce_rules: bool = True,
-) -> None:
-    """Create a new user record with a salted password hash."""
+def _new_user_row(username: str, password: str, is_admin: bool, enforce_rules: bool) -> Tuple[str, bytes, bytes, int]:
+    """Validate new-user input and return the (username, salt, pw_hash, is_admin) row to insert."""
     username = (username or "").strip()
     if not username:
         raise ValueError("Username cannot be empty.")
@@ -118,14 +189,38 @@ def create_user(
 
     salt = secrets.token_bytes(16)
     pw_hash = _hash_password(password, salt)
+    return username, salt, pw_hash, 1 if is_admin else 0
+
+
+def create_user(
+    username: str,
+    password: str,
+    is_admin: bool = False,
+    db_path: str = DEFAULT_DB_PATH,
+    enforce_rules: bool = True,
+) -> None:
+    """Create a new user record with a salted password hash."""
+    row = _new_user_row(username, password, is_admin, enforce_rules)
     with _connect(db_path) as conn:
-        conn.execute(
-            "INSERT INTO users (username, salt, pw_hash, is_admin, created_at) VALUES (?, ?, ?, ?, datetime('now'))",
-            (username, salt, pw_hash, 1 if is_admin else 0),
-        )
+        conn.execute(_INSERT_USER_SQL, row)
         conn.commit()
 
 
+def create_user_if_absent(
+    username: str,
+    password: str,
+    is_admin: bool = False,
+    db_path: str = DEFAULT_DB_PATH,
+    enforce_rules: bool = True,
+) -> bool:
+    """Create a user unless the username is taken. Returns True if a row was inserted."""
+    row = _new_user_row(username, password, is_admin, enforce_rules)
+    with _connect(db_path) as conn:
+        cur = conn.execute(_INSERT_USER_SQL + " ON CONFLICT(username) DO NOTHING", row)
+        conn.commit()
+        return cur.rowcount == 1
+
+
 def delete_user(username: str, db_path: str = DEFAULT_DB_PATH) -> bool:
     """Delete a user by username. Returns True if a row was deleted."""
     username = (username or "").strip()
@@ -197,3 +292,8 @@ def set_password(username: str, new_password: str, db_path: str = DEFAULT_DB_PAT
         )
         conn.commit()
         return cur.rowcount > 0
+
+
+def authenticate_async(username: str, password: str, db_path: str = DEFAULT_DB_PATH) -> Future[Optional[User]]:
+    """Run authenticate on a background worker and return a Future for the result."""
+    return _HASH_POOL.submit(authenticate, username, password, db_path)
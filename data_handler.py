@@ -8,8 +8,10 @@ symptoms vs non-symptoms via heuristics and performs basic cleaning.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Tuple
+import os
+import tempfile
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -17,10 +19,17 @@ import pandas as pd
 
 @dataclass(frozen=True)
 class DatasetInfo:
-    """Holds inferred dataset schema details."""
+    """Holds inferred dataset schema details and precomputed symptom arrays."""
     diagnosis_col: str
     symptom_cols: List[str]
     non_symptom_cols: List[str]
+    # Dense (rows x symptoms) float32 matrix, column order follows symptom_cols.
+    symptom_matrix: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    # Lowercased symptom name -> column index into symptom_matrix.
+    symptom_index: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    # Per-row integer diagnosis codes and the labels they index into.
+    diag_codes: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    diag_labels: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
 
 
 DEFAULT_EXCLUDES = {
@@ -81,20 +90,139 @@ def infer_columns(df: pd.DataFrame, diagnosis_col: str = "diagnosis") -> Dataset
     return DatasetInfo(diagnosis_col=diagnosis_col, symptom_cols=symptom_cols, non_symptom_cols=non_symptom_cols)
 
 
-def load_dataset(csv_path: str) -> Tuple[pd.DataFrame, DatasetInfo]:
-    """Load a CSV dataset and perform basic cleaning and schema inference."""
+def build_symptom_matrix(df: pd.DataFrame, info: DatasetInfo) -> DatasetInfo:
+    """
+    Return a copy of info carrying the symptom matrix and factorized diagnoses.
+
+    Symptom values are coerced to numbers once here (skipped when the columns are
+    already numeric) so that queries can work on a single contiguous NumPy array
+    instead of re-parsing pandas columns each time.
+    """
+    block = df[info.symptom_cols]
+    if not all(pd.api.types.is_numeric_dtype(t) for t in block.dtypes):
+        block = block.apply(pd.to_numeric, errors="coerce")
+    matrix = block.fillna(0).to_numpy(dtype=np.float32, copy=True)
+    codes, labels = pd.factorize(df[info.diagnosis_col], use_na_sentinel=False)
+    return replace(
+        info,
+        symptom_matrix=matrix,
+        symptom_index={c.lower(): i for i, c in enumerate(info.symptom_cols)},
+        diag_codes=codes,
+        diag_labels=np.asarray(labels, dtype=object),
+    )
+
+
+# CSVs larger than this are streamed into the sidecar CSV_CHUNK_ROWS rows at a time.
+LARGE_CSV_BYTES = 500 * 1024 * 1024
+CSV_CHUNK_ROWS = 1_000_000
+
+
+def _stream_csv_to_parquet(csv_path: str, parquet_path: str) -> Optional[pd.DataFrame]:
+    """
+    Parse a large CSV chunk by chunk into the Parquet sidecar, then read it back once.
+
+    Only one chunk is held in memory while parsing. Returns None, leaving no
+    sidecar, if pyarrow is missing, the sidecar cannot be written, or a later
+    chunk infers different column types from the first one (e.g. "32.0" in an
+    integer column); the caller then parses the CSV in one go.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+
+    tmp_path = None
+    writer = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(parquet_path) or ".", suffix=".parquet.tmp")
+        os.close(fd)
+        first_dtypes = None
+        for chunk in pd.read_csv(csv_path, chunksize=CSV_CHUNK_ROWS):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                first_dtypes = chunk.dtypes
+                writer = pq.ParquetWriter(tmp_path, table.schema, compression="zstd")
+            elif not (chunk.dtypes.equals(first_dtypes) and table.schema.equals(writer.schema)):
+                # Types are inferred per chunk; if any chunk disagrees, a whole-file parse may not match.
+                return None
+            writer.write_table(table)
+        if writer is None:
+            return None
+        writer.close()
+        writer = None
+        df = pd.read_parquet(tmp_path)
+        # read_csv marks missing values in object columns as NaN; Parquet hands them back as None.
+        for c in df.columns[df.dtypes == object]:
+            df[c] = df[c].where(df[c].notna(), np.nan)
+        os.replace(tmp_path, parquet_path)
+        return df
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+    finally:
+        if writer is not None:
+            writer.close()
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_csv_cached(csv_path: str) -> pd.DataFrame:
+    """
+    Read csv_path, preferring a Parquet sidecar ("<csv>.parquet") newer than the CSV.
+
+    The sidecar holds the raw parsed CSV and is written after the first parse.
+    Parquet support is optional (pyarrow or fastparquet); if it is missing, or the
+    sidecar cannot be read or written, this is a plain pd.read_csv.
+    """
+    parquet_path = csv_path + ".parquet"
+    try:
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+            return pd.read_parquet(parquet_path)
+    except (OSError, ImportError, ValueError):
+        pass
+
+    if os.path.getsize(csv_path) > LARGE_CSV_BYTES:
+        df = _stream_csv_to_parquet(csv_path, parquet_path)
+        if df is not None:
+            return df
+
     df = pd.read_csv(csv_path)
+    _write_parquet_sidecar(df, parquet_path)
+    return df
+
+
+def _write_parquet_sidecar(df: pd.DataFrame, parquet_path: str) -> None:
+    """Write df to parquet_path via a unique temp file, ignoring failures (the sidecar is only a cache)."""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(parquet_path) or ".", suffix=".parquet.tmp")
+        os.close(fd)
+        df.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, parquet_path)
+    except (OSError, ImportError, ValueError):
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_dataset(csv_path: str) -> Tuple[pd.DataFrame, DatasetInfo]:
+    """Load a CSV dataset (via its Parquet sidecar when fresh) and perform basic cleaning and schema inference."""
+    df = _read_csv_cached(csv_path)
     df.columns = [c.strip() for c in df.columns]
 
     info = infer_columns(df, diagnosis_col="diagnosis")
 
     df[info.diagnosis_col] = df[info.diagnosis_col].astype(str).str.strip()
-    df[info.diagnosis_col] = df[info.diagnosis_col].replace({"": np.nan}).fillna("Unknown")
+    df[info.diagnosis_col] = (
+        df[info.diagnosis_col].replace({"": np.nan}).fillna("Unknown").astype("category")
+    )
 
-    for c in info.symptom_cols:
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).clip(lower=0)
+    if info.symptom_cols:
+        df[info.symptom_cols] = (
+            df[info.symptom_cols].apply(pd.to_numeric, errors="coerce").fillna(0).clip(lower=0)
+        )
 
     if "gender" in df.columns:
         df["gender"] = df["gender"].astype(str).str.strip().str.title()
 
+    info = build_symptom_matrix(df, info)
     return df, info
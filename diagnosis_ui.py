@@ -36,6 +36,7 @@ def diagnosis_menu(df: pd.DataFrame, info: DatasetInfo, state: dict) -> None:
                 symptom_cols=info.symptom_cols,
                 user_symptoms=user_symptoms,
                 threshold=threshold,
+                info=info,
             )
             print("")
             for n in notes:
@@ -10,10 +10,10 @@ from typing import Optional
 
 from ..auth import (
     User,
-    authenticate,
+    authenticate_async,
     create_user,
+    create_user_if_absent,
     delete_user,
-    get_user_by_username,
     list_users,
     set_password,
     validate_password_rules,
@@ -33,7 +33,9 @@ def startup_menu(db_path: str) -> Optional[User]:
         if choice == "1":
             username = prompt("Username: ")
             password = prompt("Password: ")
-            user = authenticate(username, password, db_path=db_path)
+            pending = authenticate_async(username, password, db_path=db_path)
+            print("Signing in...")
+            user = pending.result()
             if not user:
                 print("Invalid username or password.")
                 pause()
@@ -47,10 +49,6 @@ def startup_menu(db_path: str) -> Optional[User]:
                 print("Username cannot be empty.")
                 pause()
                 continue
-            if get_user_by_username(username, db_path=db_path) is not None:
-                print("That username already exists. Try logging in.")
-                pause()
-                continue
 
             print("\nPassword rules: at least 8 chars + lowercase + uppercase + digit + special char.")
             pw = prompt("Choose a password: ")
@@ -66,8 +64,10 @@ def startup_menu(db_path: str) -> Optional[User]:
                 continue
 
             try:
-                create_user(username, pw, is_admin=False, db_path=db_path)
-                print("Account created successfully. Please log in now.")
+                if create_user_if_absent(username, pw, is_admin=False, db_path=db_path):
+                    print("Account created successfully. Please log in now.")
+                else:
+                    print("That username already exists. Try logging in.")
             except Exception as e:
                 print("Could not create account:", e)
             pause()
@@ -7,10 +7,14 @@ a set of symptoms and reports the most frequent diagnoses among those rows.
 
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .data_handler import DatasetInfo
+from .rules_fast import masked_bincount
+
 
 def normalize_symptom_name(name: str) -> str:
     """Normalize a symptom name to a column-like token (lowercase, underscores)."""
@@ -31,10 +35,14 @@ def suggest_diagnosis(
     user_symptoms: List[str],
     threshold: float = 0,
     top_k: int = 3,
+    info: Optional[DatasetInfo] = None,
 ) -> Tuple[int, List[Tuple[str, int]], List[str]]:
     """
     Suggest diagnoses by filtering records that match all entered symptoms.
 
+    If info carries a precomputed symptom matrix (see data_handler.build_symptom_matrix),
+    matching and counting run on NumPy arrays; otherwise df is filtered directly.
+
     Returns:
     - matched_count: number of matching records
     - suggestions: list of (diagnosis, count) among matching records
@@ -43,10 +51,16 @@ def suggest_diagnosis(
     if not user_symptoms:
         return 0, [], ["No symptoms entered."]
 
-    col_map = {c.lower(): c for c in symptom_cols}
-    resolved = [col_map[s] for s in user_symptoms if s in col_map]
+    if info is not None and info.symptom_index:
+        # Reuse the lowercase name -> column position lookup built at load time.
+        index = info.symptom_index
+        resolved = [info.symptom_cols[index[s]] for s in user_symptoms if s in index]
+        unknown = [s for s in user_symptoms if s not in index]
+    else:
+        col_map = {c.lower(): c for c in symptom_cols}
+        resolved = [col_map[s] for s in user_symptoms if s in col_map]
+        unknown = [s for s in user_symptoms if s not in col_map]
 
-    unknown = [s for s in user_symptoms if s not in col_map]
     notes: List[str] = []
     if unknown:
         notes.append(f"Ignored unknown symptom(s): {', '.join(unknown)}")
@@ -55,9 +69,11 @@ def suggest_diagnosis(
         notes.append("None of the entered symptoms matched dataset symptom columns.")
         return 0, [], notes
 
-    mask = pd.Series([True] * len(df))
-    for c in resolved:
-        mask = mask & (pd.to_numeric(df[c], errors="coerce").fillna(0) > threshold)
+    if info is not None and info.symptom_matrix is not None:
+        return _suggest_from_matrix(info, resolved, threshold, top_k, notes)
+
+    values = df[resolved].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy()
+    mask = (values > threshold).all(axis=1)
 
     matched = df[mask]
     matched_count = int(len(matched))
@@ -65,6 +81,36 @@ def suggest_diagnosis(
         notes.append("No matching records found for that symptom set.")
         return 0, [], notes
 
-    vc = matched[diagnosis_col].astype(str).value_counts().head(top_k)
-    suggestions = [(idx, int(v)) for idx, v in vc.items()]
+    # Categorical diagnosis columns count by code here; _top_counts drops unmatched categories.
+    vc = matched[diagnosis_col].value_counts()
+    suggestions = _top_counts(vc.index.to_numpy(), vc.to_numpy(), top_k)
     return matched_count, suggestions, notes
+
+
+def _suggest_from_matrix(
+    info: DatasetInfo,
+    resolved: List[str],
+    threshold: float,
+    top_k: int,
+    notes: List[str],
+) -> Tuple[int, List[Tuple[str, int]], List[str]]:
+    """Matrix-backed variant of suggest_diagnosis using the arrays stored on info."""
+    idx = [info.symptom_index[c.lower()] for c in resolved]
+    matched_count, counts = masked_bincount(
+        info.symptom_matrix, idx, threshold, info.diag_codes, len(info.diag_labels)
+    )
+    if matched_count == 0:
+        notes.append("No matching records found for that symptom set.")
+        return 0, [], notes
+
+    suggestions = _top_counts(info.diag_labels, counts, top_k)
+    return matched_count, suggestions, notes
+
+
+def _top_counts(labels: np.ndarray, counts: np.ndarray, top_k: int) -> List[Tuple[str, int]]:
+    """Return up to top_k (label, count) pairs with count > 0, ordered by count desc then label asc."""
+    labels = np.asarray(labels).astype(str)
+    counts = np.asarray(counts)
+    order = np.lexsort((labels, -counts))
+    order = order[counts[order] > 0][:top_k]
+    return [(str(labels[i]), int(counts[i])) for i in order]
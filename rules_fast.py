@@ -0,0 +1,53 @@
+"""
+Optional compiled kernel for the rule-based matcher.
+
+masked_bincount fuses the two steps of suggest_diagnosis on the precomputed
+symptom matrix (row filter "all selected symptoms > threshold" and the
+per-diagnosis count) into a single pass over the rows. For matrices with at
+least NUMBA_MIN_ROWS rows the Numba kernel in rules_numba is used when numba is
+installed; otherwise, and for smaller matrices, an equivalent NumPy
+implementation is used.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+# Below this many rows NumPy is already sub-millisecond and the kernel's
+# one-off compile (seconds with parallel=True) would dominate.
+NUMBA_MIN_ROWS = 1_000_000
+
+
+def _masked_bincount_numpy(
+    matrix: np.ndarray, cols: np.ndarray, threshold: float, codes: np.ndarray, n_diag: int
+) -> Tuple[int, np.ndarray]:
+    """NumPy fallback: boolean row mask followed by bincount over diagnosis codes."""
+    mask = (matrix[:, cols] > threshold).all(axis=1)
+    counts = np.bincount(codes[mask], minlength=n_diag)
+    return int(mask.sum()), counts
+
+
+def masked_bincount(
+    matrix: np.ndarray, cols: np.ndarray, threshold: float, codes: np.ndarray, n_diag: int
+) -> Tuple[int, np.ndarray]:
+    """
+    Count rows where every column in cols is > threshold, overall and per diagnosis code.
+
+    Returns (matched_count, counts) where counts has length n_diag.
+    """
+    cols = np.asarray(cols, dtype=np.intp)
+    # Compare in the matrix dtype on both paths so results don't depend on numba being installed.
+    threshold = matrix.dtype.type(threshold)
+    if matrix.shape[0] >= NUMBA_MIN_ROWS:
+        try:
+            from numba import get_num_threads
+
+            from .rules_numba import _masked_bincount_numba
+        except ImportError:  # numba is optional
+            pass
+        else:
+            total, counts = _masked_bincount_numba(matrix, cols, threshold, codes, n_diag, get_num_threads())
+            return int(total), counts
+    return _masked_bincount_numpy(matrix, cols, threshold, codes, n_diag)
@@ -0,0 +1,31 @@
+"""
+Numba kernel for rules_fast.masked_bincount.
+
+Importing this module imports numba; rules_fast only does so for matrices large
+enough to be worth the one-off compile.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def _masked_bincount_numba(matrix, cols, threshold, codes, n_diag, n_chunks):
+    n_rows = matrix.shape[0]
+    chunk = (n_rows + n_chunks - 1) // n_chunks
+    # One counts row per chunk so parallel iterations never write the same cell.
+    partial = np.zeros((n_chunks, n_diag), np.int64)
+    for t in prange(n_chunks):
+        stop = min(n_rows, (t + 1) * chunk)
+        for i in range(t * chunk, stop):
+            ok = True
+            for k in range(cols.shape[0]):
+                if matrix[i, cols[k]] <= threshold:
+                    ok = False
+                    break
+            if ok:
+                partial[t, codes[i]] += 1
+    counts = partial.sum(axis=0)
+    return counts.sum(), counts
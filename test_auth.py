@@ -0,0 +1,62 @@
+import pytest
+import symptom_explorer.auth as auth
+
+
+def test_connections_reopen_after_close(tmp_path):
+    db = str(tmp_path / "users.db")
+    auth.init_db(db)
+    assert auth.authenticate_async("admin", "Admin123!", db_path=db).result() is not None
+
+    auth.close_connections()
+    assert auth.authenticate_async("admin", "Admin123!", db_path=db).result() is not None
+    assert auth.authenticate("guest", "Guest123!", db_path=db) is not None
+
+
+def _stored_credentials(db, username):
+    return auth._connect(db).execute("SELECT salt, pw_hash FROM users WHERE username = ?", (username,)).fetchone()
+
+
+def test_create_user_if_absent(tmp_path):
+    db = str(tmp_path / "users.db")
+    auth.init_db(db)
+
+    assert auth.create_user_if_absent("  newbie  ", "Newbie123!", db_path=db) is True
+    before = tuple(_stored_credentials(db, "newbie"))
+
+    assert auth.create_user_if_absent("newbie", "Other123!", db_path=db) is False
+    assert tuple(_stored_credentials(db, "newbie")) == before
+    assert auth.authenticate("newbie", "Newbie123!", db_path=db) is not None
+    assert auth.authenticate("newbie", "Other123!", db_path=db) is None
+
+
+@pytest.mark.parametrize(
+    "username, password, is_admin",
+    [
+        ("admin", "Admin123!", True),
+        ("student1", "Student123!", False),
+        ("student2", "Student123!", False),
+        ("guest", "Guest123!", False),
+    ],
+)
+def test_seed_users_match_documented_passwords(tmp_path, username, password, is_admin):
+    db = str(tmp_path / "users.db")
+    auth.init_db(db)
+    user = auth.authenticate(username, password, db_path=db)
+    assert user is not None and user.is_admin is is_admin
+
+
+@pytest.mark.parametrize(
+    "password, ok, message_part",
+    [
+        ("Abcdef1!", True, "OK"),
+        ("Abcdef12_", False, "special"),  # "_" is a word character, not special
+        ("ÉéÉéÉ1!A", False, "lowercase"),  # "é" is not in [a-z]
+        ("Abcdefg٣!", True, "OK"),  # Arabic-Indic three is a decimal digit
+        ("Abc def!1", True, "OK"),
+        ("Abcdef1 x", False, "special"),  # whitespace is not special either
+    ],
+)
+def test_validate_password_rules_character_classes(password, ok, message_part):
+    result, message = auth.validate_password_rules(password)
+    assert result is ok
+    assert message_part in message
@@ -0,0 +1,121 @@
+import os
+
+import pandas as pd
+import pytest
+import symptom_explorer.data_handler as dh
+
+
+def _write_csv(path, rows):
+    pd.DataFrame(
+        {"diagnosis": [d for d, _ in rows], "fever": [f for _, f in rows], "age": [30 + i for i in range(len(rows))]}
+    ).to_csv(path, index=False)
+
+
+def test_sidecar_reused_when_fresh(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    csv = tmp_path / "data.csv"
+    _write_csv(csv, [("Flu", 1), ("Cold", 0)])
+    first, _ = dh.load_dataset(str(csv))
+    assert os.path.exists(str(csv) + ".parquet")
+
+    def no_csv(*args, **kwargs):
+        raise AssertionError("CSV should not be parsed when the sidecar is fresh")
+
+    monkeypatch.setattr(dh.pd, "read_csv", no_csv)
+    second, _ = dh.load_dataset(str(csv))
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_sidecar_reparsed_when_csv_newer(tmp_path):
+    pytest.importorskip("pyarrow")
+    csv = tmp_path / "data.csv"
+    _write_csv(csv, [("Flu", 1), ("Cold", 0)])
+    dh.load_dataset(str(csv))
+
+    _write_csv(csv, [("Flu", 1), ("Cold", 0), ("Allergy", 1)])
+    sidecar_mtime = os.path.getmtime(str(csv) + ".parquet")
+    os.utime(csv, (sidecar_mtime + 10, sidecar_mtime + 10))
+    df, _ = dh.load_dataset(str(csv))
+    assert len(df) == 3
+    assert "Allergy" in set(df["diagnosis"])
+
+
+def test_sidecar_write_failure_falls_back_to_csv(tmp_path, monkeypatch):
+    csv = tmp_path / "data.csv"
+    _write_csv(csv, [("Flu", 1), ("Cold", 0)])
+
+    def fail(*args, **kwargs):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", fail)
+    df, info = dh.load_dataset(str(csv))
+    assert len(df) == 2 and info.symptom_cols == ["fever"]
+    assert sorted(os.listdir(tmp_path)) == ["data.csv"]
+
+
+def _load_both_ways(tmp_path, monkeypatch, csv_text, chunk_rows):
+    normal_dir, chunked_dir = tmp_path / "normal", tmp_path / "chunked"
+    for d in (normal_dir, chunked_dir):
+        d.mkdir()
+        (d / "data.csv").write_text(csv_text)
+    normal, _ = dh.load_dataset(str(normal_dir / "data.csv"))
+    monkeypatch.setattr(dh, "LARGE_CSV_BYTES", 0)
+    monkeypatch.setattr(dh, "CSV_CHUNK_ROWS", chunk_rows)
+    # Only the whole-file fallback writes through _write_parquet_sidecar.
+    fallback_writes = []
+    write = dh._write_parquet_sidecar
+    monkeypatch.setattr(dh, "_write_parquet_sidecar", lambda *a: (fallback_writes.append(a), write(*a)))
+    chunked, _ = dh.load_dataset(str(chunked_dir / "data.csv"))
+    return normal, chunked, chunked_dir, fallback_writes
+
+
+def test_chunked_load_matches_normal_load(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    here = os.path.dirname(os.path.abspath(__file__))
+    bundled = os.path.join(here, "synthetic_medical_symptoms_and_diagnosis_dataset.csv")
+    with open(bundled) as f:
+        csv_text = f.read()
+    normal, chunked, chunked_dir, fallback_writes = _load_both_ways(tmp_path, monkeypatch, csv_text, chunk_rows=700)
+    assert fallback_writes == []
+    pd.testing.assert_frame_equal(normal, chunked)
+    assert sorted(os.listdir(chunked_dir)) == ["data.csv", "data.csv.parquet"]
+
+
+def test_chunked_load_falls_back_when_chunk_types_differ(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    # The second chunk's fractional age can't be cast to the first chunk's int64 schema.
+    csv_text = "diagnosis,fever,age\nFlu,1,30\nCold,0,31\nFlu,1,32.5\nCold,0,33\n"
+    normal, chunked, _, fallback_writes = _load_both_ways(tmp_path, monkeypatch, csv_text, chunk_rows=2)
+    assert len(fallback_writes) == 1
+    pd.testing.assert_frame_equal(normal, chunked)
+    assert chunked["age"].dtype == "float64"
+
+
+@pytest.mark.parametrize(
+    "csv_text",
+    [
+        # "32.0" parses as float64 in the second chunk; a whole-file parse makes age float64.
+        "diagnosis,fever,age\nFlu,1,30\nCold,0,31\nFlu,1,32.0\nCold,0,33\n",
+        # A missing age makes the second chunk float64 while the first is int64.
+        "diagnosis,fever,age\nFlu,1,30\nCold,0,31\nFlu,1,\nCold,0,33\n",
+        # bool in the first chunk, object (True/NaN) in the second.
+        "diagnosis,fever,flag\nFlu,1,True\nCold,0,False\nFlu,1,\nCold,0,True\n",
+    ],
+)
+def test_chunked_load_falls_back_on_losslessly_castable_chunks(tmp_path, monkeypatch, csv_text):
+    pytest.importorskip("pyarrow")
+    normal, chunked, _, fallback_writes = _load_both_ways(tmp_path, monkeypatch, csv_text, chunk_rows=2)
+    assert len(fallback_writes) == 1
+    pd.testing.assert_frame_equal(normal, chunked)
+
+
+def test_chunked_load_keeps_nan_in_object_columns(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    # Every chunk infers object for flag, so it streams; missing values must stay NaN, not None.
+    csv_text = "diagnosis,fever,flag\nFlu,1,True\nCold,0,\nFlu,1,\nCold,0,False\n"
+    normal, chunked, _, fallback_writes = _load_both_ways(tmp_path, monkeypatch, csv_text, chunk_rows=2)
+    assert fallback_writes == []
+    pd.testing.assert_frame_equal(normal, chunked)
+    # assert_frame_equal treats None and NaN alike, so compare the missing-value objects directly.
+    assert [type(v) for v in chunked["flag"]] == [type(v) for v in normal["flag"]]
+
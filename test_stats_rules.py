@@ -1,10 +1,13 @@
 import os, sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import numpy as np
 import pandas as pd
+import pytest
 import symptom_explorer.data_handler as dh
 import symptom_explorer.stats as st
 import symptom_explorer.rules as rules
+import symptom_explorer.rules_fast as rules_fast
 
 
 def _toy_df():
@@ -31,6 +34,51 @@ def test_rules_suggest_diagnosis():
     assert isinstance(notes, list)
 
 
+def test_rules_suggest_diagnosis_matrix_matches_frame():
+    df = _toy_df()
+    info = dh.build_symptom_matrix(df, dh.infer_columns(df, diagnosis_col="diagnosis"))
+    for symptoms in (["fever"], ["cough"], ["fever", "cough"], ["sneeze"]):
+        expected = rules.suggest_diagnosis(df, info.diagnosis_col, info.symptom_cols, symptoms, threshold=0)
+        got = rules.suggest_diagnosis(df, info.diagnosis_col, info.symptom_cols, symptoms, threshold=0, info=info)
+        assert got == expected
+
+
+def test_rules_suggest_diagnosis_breaks_ties_by_label():
+    df = pd.DataFrame({"diagnosis": ["Flu", "Cold", "Flu", "Cold", "Allergy"], "fever": [1, 1, 1, 1, 1]})
+    info = dh.build_symptom_matrix(df, dh.infer_columns(df, diagnosis_col="diagnosis"))
+    for frame in (df, df.astype({"diagnosis": "category"})):
+        for use_info in (None, info):
+            _, sugg, _ = rules.suggest_diagnosis(frame, info.diagnosis_col, info.symptom_cols, ["fever"], info=use_info)
+            assert sugg == [("Cold", 2), ("Flu", 2), ("Allergy", 1)]
+            _, sugg, _ = rules.suggest_diagnosis(
+                frame, info.diagnosis_col, info.symptom_cols, ["fever"], top_k=1, info=use_info
+            )
+            assert sugg == [("Cold", 2)]
+
+
+def test_masked_bincount_numba_matches_numpy(monkeypatch):
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(0)
+    cases = [(np.array([[3.0], [0.1]], dtype=np.float32), np.array([0, 1]), 2)]
+    matrix = rng.integers(0, 4, (1001, 5)).astype(np.float32)
+    matrix[::7, 2] = 0.1
+    cases.append((matrix, rng.integers(0, 4, 1001), 4))
+
+    for matrix, codes, n_diag in cases:
+        for cols in ([0], list(range(matrix.shape[1]))):
+            for thr in (0, 0.1, 1.5, 2.99999999):
+                monkeypatch.setattr(rules_fast, "NUMBA_MIN_ROWS", 10**12)
+                expected = rules_fast.masked_bincount(matrix, cols, thr, codes, n_diag)
+                monkeypatch.setattr(rules_fast, "NUMBA_MIN_ROWS", 0)
+                got = rules_fast.masked_bincount(matrix, cols, thr, codes, n_diag)
+                assert got[0] == expected[0]
+                assert np.array_equal(got[1], expected[1])
+
+    # float32(2.99999999) == 3.0, so the row holding 3 is not above the threshold.
+    total, counts = rules_fast.masked_bincount(cases[0][0], [0], 2.99999999, cases[0][1], 2)
+    assert total == 0 and counts.tolist() == [0, 0]
+
+
 if __name__ == "__main__":
     import pytest
     raise SystemExit(pytest.main([__file__]))